@@ -1,10 +1,21 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+from pandas.api.types import CategoricalDtype
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import plotly.express as px
 import uuid
+import time
+from collections import Counter
 from datetime import datetime, date
 import os
-import json
+import shutil
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 
 st.set_page_config(page_title="Crime Unit Management System", layout="wide", initial_sidebar_state="expanded", page_icon="🚓")
 
@@ -19,11 +30,10 @@ st.markdown("""
 
 st.markdown('<h1 class="main-header">🚓 Crime Unit Management System</h1>', unsafe_allow_html=True)
 
+def empty_aggregates():
+    return {'status': Counter(), 'type': Counter(), 'priority': Counter(), 'officer': Counter(), 'timeline': Counter(), 'total': 0}
+
 def initialize_session_state():
-    if "crimes" not in st.session_state:
-        st.session_state.crimes = []
-    if "uploaded_files" not in st.session_state:
-        st.session_state.uploaded_files = {}
     if "officers" not in st.session_state:
         st.session_state.officers = ["Officer Smith", "Officer Johnson", "Officer Brown", "Officer Davis", "Officer Wilson"]
 
@@ -32,9 +42,20 @@ initialize_session_state()
 CRIME_TYPES = ["Theft", "Murder", "Assault", "Cybercrime", "Fraud", "Burglary", "Drug Offense", "Vandalism", "Domestic Violence", "Other"]
 STATUSES = ["Open", "Under Investigation", "Closed", "Cold Case", "Pending Review"]
 PRIORITIES = ["Low", "Medium", "High", "Critical"]
+CRIME_COLUMNS = ["ID", "Type", "Location", "Officer", "Status", "Priority", "Description", "Notes", "Date_Registered", "Incident_Date", "Files", "Evidence"]
+CRIME_COLUMN_TYPES = {"Files": pa.int64(), "Evidence": pa.list_(pa.string())}
+CRIME_SCHEMA = pa.schema([("Seq", pa.int64())] + [(col, CRIME_COLUMN_TYPES.get(col, pa.string())) for col in CRIME_COLUMNS])
+SEARCH_COLUMNS = [col for col in CRIME_COLUMNS if col != "Evidence"]
+UPLOADS_PATH = "uploads"
+CRIMES_TABLE_PATH = "data/crimes.parquet"
+CRIMES_LOCK_PATH = "data/crimes.lock"
+CRIMES_LOCK_STALE_SECONDS = 30
+AGGREGATE_COLUMNS = {'status': 'Status', 'type': 'Type', 'priority': 'Priority', 'officer': 'Officer'}
+EXPORT_COLUMN_TYPES = {'Incident_Date': pa.date32(), 'Date_Registered': pa.timestamp('s')}
+DETAIL_COLUMNS = ['ID', 'Type', 'Location', 'Officer', 'Status', 'Priority', 'Incident_Date', 'Date_Registered', 'Files', 'Description', 'Notes', 'Evidence']
 
 def generate_crime_id():
-    return f"CASE-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:6].upper()}"
+    return f"CASE-{time.strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
 
 def validate_form_data(crime_type, location, officer, description):
     errors = []
@@ -48,19 +69,255 @@ def validate_form_data(crime_type, location, officer, description):
         errors.append("Description must be at least 10 characters long")
     return errors
 
-def export_to_csv(data):
-    df = pd.DataFrame(data)
-    if not df.empty:
-        df = df.drop(columns=["File"], errors='ignore')
-    return df.to_csv(index=False).encode('utf-8')
+def save_uploaded_file(uploaded_file, file_name):
+    with open(file_name, "wb") as f:
+        shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
+    return file_name
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_file_bytes(path, mtime):
+    with open(path, "rb") as file:
+        return file.read()
+
+def csv_field(values):
+    values = pc.fill_null(values.cast(pa.string()), "")
+    quoted = pc.binary_join_element_wise('"', pc.replace_substring(values, '"', '""'), '"', "")
+    return pc.if_else(pc.match_substring_regex(values, '[",\r\n]'), quoted, values)
+
+def export_to_csv(df):
+    df = df.drop(columns=["File", "Evidence"], errors='ignore')
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = pa.schema([
+        pa.field(field.name, EXPORT_COLUMN_TYPES.get(field.name, field.type.value_type if pa.types.is_dictionary(field.type) else field.type))
+        for field in table.schema
+    ])
+    table = table.cast(schema)
+    lines = pc.binary_join_element_wise(*[csv_field(column) for column in table.columns], ",")
+    lines = lines.combine_chunks() if isinstance(lines, pa.ChunkedArray) else lines
+    lines = pa.concat_arrays([pa.array([",".join(table.column_names)]), lines, pa.array([""])])
+    return pc.binary_join(pa.ListArray.from_arrays([0, len(lines)], lines), os.linesep)[0].as_py().encode('utf-8')
+
+def crimes_dataset_signature():
+    try:
+        stat = os.stat(CRIMES_TABLE_PATH)
+    except FileNotFoundError:
+        return ()
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def read_crimes_table():
+    try:
+        return pq.read_table(CRIMES_TABLE_PATH, schema=CRIME_SCHEMA).sort_by('Seq')
+    except FileNotFoundError:
+        return CRIME_SCHEMA.empty_table()
+
+def write_crimes_table(table):
+    tmp_path = f"{CRIMES_TABLE_PATH}.{uuid.uuid4().hex}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, CRIMES_TABLE_PATH)
+
+@contextmanager
+def crimes_write_lock():
+    os.makedirs(os.path.dirname(CRIMES_LOCK_PATH), exist_ok=True)
+    while True:
+        try:
+            fd = os.open(CRIMES_LOCK_PATH, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(CRIMES_LOCK_PATH) > CRIMES_LOCK_STALE_SECONDS:
+                    os.remove(CRIMES_LOCK_PATH)
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(CRIMES_LOCK_PATH)
+
+@st.cache_resource(show_spinner=False)
+def crimes_store():
+    return {'lock': threading.RLock(), 'signature': None, 'data': None}
+
+def load_crimes(signature):
+    store = crimes_store()
+    with store['lock']:
+        if store['signature'] != signature:
+            current = crimes_dataset_signature()
+            if store['signature'] != current:
+                store['data'] = crimes_data(read_crimes_table())
+                store['signature'] = current
+        return store['data']
+
+def backup_records(signature):
+    data = load_crimes(signature)
+    if 'records' not in data:
+        data['records'] = data['table'].select(CRIME_COLUMNS).to_pylist()
+    return data['records']
+
+def append_crime(record):
+    store = crimes_store()
+    with crimes_write_lock(), store['lock']:
+        before = crimes_dataset_signature()
+        data = load_crimes(before)
+        row = pa.Table.from_pylist([{**record, 'Seq': data['table'].num_rows}], schema=CRIME_SCHEMA)
+        table = pa.concat_tables([data['table'], row]).combine_chunks()
+        write_crimes_table(table)
+        search_index = extend_search_index(data['search_index'], search_rows(row.to_pandas()))
+        store['data'] = crimes_data(table, search_index)
+        store['signature'] = crimes_dataset_signature()
+    if st.session_state.get('agg_signature') == before:
+        record_aggregates(record)
+    else:
+        st.session_state.agg = aggregates_from_df(store['data']['df'])
+    st.session_state.agg_signature = store['signature']
+
+def clear_crimes():
+    store = crimes_store()
+    with crimes_write_lock(), store['lock']:
+        if os.path.exists(CRIMES_TABLE_PATH):
+            os.remove(CRIMES_TABLE_PATH)
+        shutil.rmtree(UPLOADS_PATH, ignore_errors=True)
+        store['data'] = crimes_data(CRIME_SCHEMA.empty_table())
+        store['signature'] = crimes_dataset_signature()
+    st.session_state.agg = empty_aggregates()
+    st.session_state.agg_signature = store['signature']
+
+def month_index(day):
+    return day.year * 12 + day.month - 1
+
+def month_label(index):
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+def record_aggregates(record):
+    agg = st.session_state.agg
+    for key, col in AGGREGATE_COLUMNS.items():
+        agg[key][record[col]] += 1
+    agg['timeline'][(month_index(date.fromisoformat(record['Incident_Date'])), record['Type'])] += 1
+    agg['total'] += 1
+
+def aggregates_from_df(df):
+    agg = empty_aggregates()
+    if df.empty:
+        return agg
+    for key, col in AGGREGATE_COLUMNS.items():
+        agg[key].update(observed_counts(df[col]).to_dict())
+    months = df['Incident_Date'].dt.year * 12 + df['Incident_Date'].dt.month - 1
+    agg['timeline'].update(zip(months.tolist(), df['Type'].astype(str).tolist()))
+    agg['total'] = len(df)
+    return agg
+
+def sync_aggregates():
+    signature = crimes_dataset_signature()
+    if st.session_state.get('agg_signature') != signature:
+        st.session_state.agg = aggregates_from_df(load_crimes(signature)['df'])
+        st.session_state.agg_signature = signature
+
+def counter_series(counter):
+    return pd.Series(dict(counter.most_common()), dtype='int64')
+
+def timeline_frame(timeline):
+    type_order = {crime_type: i for i, crime_type in enumerate(CRIME_TYPES)}
+    cells = sorted(timeline.items(), key=lambda item: (item[0][0], type_order.get(item[0][1], len(type_order))))
+    return pd.DataFrame([(month_label(month), crime_type, count) for (month, crime_type), count in cells], columns=['Month_Year', 'Type', 'Count'])
+
+def search_rows(df):
+    if df.empty:
+        return []
+    return df[SEARCH_COLUMNS].astype(str).agg(" ".join, axis=1).str.replace("\n", " ", regex=False).str.lower().tolist()
+
+def crimes_data(table, search_index=None):
+    df = table.select(CRIME_COLUMNS).to_pandas()
+    if search_index is None:
+        search_index = build_search_index(search_rows(df))
+    for col in ['Incident_Date', 'Date_Registered']:
+        df[col] = pd.to_datetime(df[col]).astype('datetime64[ns]')
+    category_values = {'Type': CRIME_TYPES, 'Status': STATUSES, 'Priority': PRIORITIES}
+    for col, values in category_values.items():
+        df[col] = df[col].astype(CategoricalDtype(values))
+    df['Officer'] = df['Officer'].astype('category')
+    return {'table': table, 'df': df, 'search_index': search_index}
+
+def observed_counts(series):
+    codes = series.cat.codes.values
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    observed = np.flatnonzero(counts)
+    observed = observed[np.argsort(-counts[observed], kind='stable')]
+    return pd.Series(counts[observed], index=series.cat.categories[observed])
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def build_summary_tables(signature):
+    df = load_crimes(signature)['df']
+    summary_columns = {'Crime Type': 'Type', 'Status': 'Status', 'Priority': 'Priority', 'Officer': 'Officer'}
+    tables = {}
+    for category, col in summary_columns.items():
+        counts = observed_counts(df[col])
+        tables[category] = pd.DataFrame({category: counts.index.astype(str), 'Count': counts.values})
+    return tables
+
+def current_crimes_data():
+    return load_crimes(st.session_state.agg_signature)
+
+def build_search_index(rows):
+    haystack = "\n".join(rows).encode()
+    newlines = np.flatnonzero(np.frombuffer(haystack, dtype=np.uint8) == ord("\n"))
+    return {'haystack': haystack, 'newlines': newlines, 'rows': len(rows)}
+
+def extend_search_index(search_index, rows):
+    if not search_index['rows']:
+        return build_search_index(rows)
+    if not rows:
+        return search_index
+    added = "\n".join(rows).encode()
+    offset = len(search_index['haystack']) + 1
+    added_newlines = np.flatnonzero(np.frombuffer(added, dtype=np.uint8) == ord("\n")) + offset
+    return {
+        'haystack': search_index['haystack'] + b"\n" + added,
+        'newlines': np.concatenate([search_index['newlines'], [offset - 1], added_newlines]),
+        'rows': search_index['rows'] + len(rows)
+    }
+
+def search_mask(search_index, search_text):
+    haystack, newlines = search_index['haystack'], search_index['newlines']
+    mask = np.zeros(search_index['rows'], dtype=bool)
+    needle = search_text.lower().encode()
+    hit = haystack.find(needle)
+    while hit != -1:
+        row = int(np.searchsorted(newlines, hit))
+        mask[row] = True
+        if row == len(newlines):
+            break
+        hit = haystack.find(needle, int(newlines[row]) + 1)
+    return mask
+
+def category_isin(series, values):
+    codes = series.cat.categories.get_indexer(values)
+    return np.isin(series.cat.codes.values, codes[codes >= 0])
+
+@st.fragment
+def officer_management():
+    st.markdown("### 👮 Officer Management")
+    new_officer = st.text_input("Add New Officer")
+    added_officer = st.session_state.pop("added_officer", None)
+    if added_officer:
+        st.success(f"Officer {added_officer} added!")
+    if st.button("➕ Add Officer") and new_officer:
+        if new_officer not in st.session_state.officers:
+            st.session_state.officers.append(new_officer)
+            st.session_state.added_officer = new_officer
+            st.rerun()
+        else:
+            st.warning("Officer already exists!")
+
+sync_aggregates()
 
 with st.sidebar:
     st.header("🎛️ Navigation & Filters")
-    total_cases = len(st.session_state.crimes)
+    total_cases = st.session_state.agg['total']
     if total_cases > 0:
-        df_temp = pd.DataFrame(st.session_state.crimes)
-        open_cases = len(df_temp[df_temp['Status'] == 'Open'])
-        closed_cases = len(df_temp[df_temp['Status'] == 'Closed'])
+        open_cases = st.session_state.agg['status']['Open']
+        closed_cases = st.session_state.agg['status']['Closed']
         st.markdown("### 📊 Quick Stats")
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -70,15 +327,7 @@ with st.sidebar:
         with col3:
             st.metric("Closed Cases", closed_cases)
     
-    st.markdown("### 👮 Officer Management")
-    new_officer = st.text_input("Add New Officer")
-    if st.button("➕ Add Officer") and new_officer:
-        if new_officer not in st.session_state.officers:
-            st.session_state.officers.append(new_officer)
-            st.success(f"Officer {new_officer} added!")
-        else:
-            st.warning("Officer already exists!")
-        
+    officer_management()
 
 def add_crime():
     st.subheader("📝 Register a New Crime Case")
@@ -115,13 +364,10 @@ def add_crime():
                     crime_id = generate_crime_id()
                     uploaded_files = []
                     if file_upload:
-                        os.makedirs("uploads", exist_ok=True)
-                        for uploaded_file in file_upload:
-                            file_name = f"uploads/{crime_id}_{uploaded_file.name}"
-                            with open(file_name, "wb") as f:
-                                f.write(uploaded_file.read())
-                            uploaded_files.append(file_name)
-                        st.session_state.uploaded_files[crime_id] = uploaded_files
+                        os.makedirs(UPLOADS_PATH, exist_ok=True)
+                        file_names = [f"{UPLOADS_PATH}/{crime_id}_{i}_{uploaded_file.name}" for i, uploaded_file in enumerate(file_upload, 1)]
+                        with ThreadPoolExecutor(max_workers=4) as executor:
+                            uploaded_files = list(executor.map(save_uploaded_file, file_upload, file_names))
                     
                     crime_record = {
                         "ID": crime_id,
@@ -132,12 +378,13 @@ def add_crime():
                         "Priority": priority,
                         "Description": description,
                         "Notes": notes,
-                        "Date_Registered": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "Incident_Date": incident_date.strftime("%Y-%m-%d"),
-                        "Files": len(uploaded_files) if uploaded_files else 0
+                        "Date_Registered": datetime.now().isoformat(sep=" ", timespec="seconds"),
+                        "Incident_Date": incident_date.isoformat(),
+                        "Files": len(uploaded_files) if uploaded_files else 0,
+                        "Evidence": uploaded_files
                     }
                     
-                    st.session_state.crimes.append(crime_record)
+                    append_crime(crime_record)
                     st.success(f"✅ Case successfully registered with ID: **{crime_id}**")
     
     with col2:
@@ -159,14 +406,16 @@ def add_crime():
         - Upload all available evidence
         """)
 
+@st.fragment
 def view_crimes():
     st.subheader("📋 View & Manage Crime Cases")
     
-    if not st.session_state.crimes:
+    if not st.session_state.agg['total']:
         st.warning("📭 No cases found. Add some cases to get started!")
         return
     
-    df = pd.DataFrame(st.session_state.crimes)
+    crimes_data = current_crimes_data()
+    df = crimes_data['df']
     
     with st.expander("🔍 Advanced Search & Filters", expanded=True):
         search_col1, search_col2, search_col3 = st.columns(3)
@@ -180,143 +429,144 @@ def view_crimes():
             priority_filter = st.multiselect("Priority", PRIORITIES, default=[])
         
         with search_col3:
-            officer_filter = st.multiselect("Officer", st.session_state.officers, default=[])
+            officer_options = list(dict.fromkeys([*st.session_state.officers, *df['Officer'].cat.categories]))
+            officer_filter = st.multiselect("Officer", officer_options, default=[])
             date_range = st.date_input("Date Range", value=[], help="Select start and end dates")
     
-    filtered_df = df.copy()
+    masks = []
     
     if search_text:
-        mask = filtered_df.astype(str).apply(lambda x: x.str.contains(search_text, case=False, na=False)).any(axis=1)
-        filtered_df = filtered_df[mask]
+        masks.append(search_mask(crimes_data['search_index'], search_text))
     
     if crime_type_filter:
-        filtered_df = filtered_df[filtered_df['Type'].isin(crime_type_filter)]
+        masks.append(category_isin(df['Type'], crime_type_filter))
     
     if status_filter:
-        filtered_df = filtered_df[filtered_df['Status'].isin(status_filter)]
+        masks.append(category_isin(df['Status'], status_filter))
     
     if priority_filter:
-        filtered_df = filtered_df[filtered_df['Priority'].isin(priority_filter)]
+        masks.append(category_isin(df['Priority'], priority_filter))
     
     if officer_filter:
-        filtered_df = filtered_df[filtered_df['Officer'].isin(officer_filter)]
+        masks.append(category_isin(df['Officer'], officer_filter))
     
     if date_range and len(date_range) == 2:
         start_date, end_date = date_range
-        filtered_df['Incident_Date'] = pd.to_datetime(filtered_df['Incident_Date'])
-        filtered_df = filtered_df[
-            (filtered_df['Incident_Date'] >= pd.to_datetime(start_date)) &
-            (filtered_df['Incident_Date'] <= pd.to_datetime(end_date))
-        ]
+        incident_ns = df['Incident_Date'].values.view('i8')
+        start_ns = np.datetime64(start_date, 'ns').astype('i8')
+        end_ns = np.datetime64(end_date, 'ns').astype('i8')
+        masks.append((incident_ns >= start_ns) & (incident_ns <= end_ns))
+    
+    filtered_df = df[np.logical_and.reduce(masks)] if masks else df
     
     st.markdown(f"**📊 Showing {len(filtered_df)} of {len(df)} cases**")
     
     if not filtered_df.empty:
-        csv_data = export_to_csv(filtered_df.to_dict('records'))
+        csv_data = export_to_csv(filtered_df)
         st.download_button(
             label="📥 Export to CSV",
             data=csv_data,
-            file_name=f"crime_cases_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            file_name=f"crime_cases_{time.strftime('%Y%m%d_%H%M%S')}.csv",
             mime='text/csv'
         )
     
-        display_df = filtered_df[['ID', 'Type', 'Location', 'Officer', 'Status', 'Priority', 'Incident_Date']].copy()
-        st.dataframe(display_df, use_container_width=True, hide_index=True)
+        display_df = filtered_df[['ID', 'Type', 'Location', 'Officer', 'Status', 'Priority', 'Incident_Date']]
+        st.dataframe(display_df, use_container_width=True, hide_index=True, column_config={'Incident_Date': st.column_config.DateColumn(format='YYYY-MM-DD')})
         
         st.markdown("### 📋 Case Details")
-        for idx, row in filtered_df.iterrows():
-            with st.expander(f"🔎 {row['ID']} - {row['Type']} | {row['Status']}", expanded=False):
-                detail_col1, detail_col2 = st.columns(2)
-                
-                with detail_col1:
-                    st.markdown(f"**📍 Location:** {row['Location']}")
-                    st.markdown(f"**👮 Officer:** {row['Officer']}")
-                    st.markdown(f"**📊 Status:** {row['Status']}")
-                    st.markdown(f"**⚡ Priority:** {row['Priority']}")
-                
-                with detail_col2:
-                    st.markdown(f"**📅 Incident Date:** {row['Incident_Date']}")
-                    st.markdown(f"**📝 Registered:** {row['Date_Registered']}")
-                    st.markdown(f"**📎 Files:** {row['Files']} attached")
-                
-                st.markdown(f"**📄 Description:**")
-                st.write(row['Description'])
-                
-                if row.get('Notes'):
-                    st.markdown(f"**📋 Notes:**")
-                    st.write(row['Notes'])
-                
-                if row['ID'] in st.session_state.uploaded_files:
-                    st.markdown("**📎 Evidence Files:**")
-                    for file_path in st.session_state.uploaded_files[row['ID']]:
-                        file_name = os.path.basename(file_path)
-                        if os.path.exists(file_path):
-                            with open(file_path, "rb") as file:
-                                st.download_button(
-                                    f"📄 {file_name}",
-                                    file.read(),
-                                    file_name=file_name,
-                                    key=f"download_{row['ID']}_{file_name}"
-                                )
+        selected_id = st.selectbox("Select case for details", filtered_df['ID'].tolist())
+        detail_df = filtered_df.loc[filtered_df['ID'] == selected_id, DETAIL_COLUMNS]
+        row = next(detail_df.itertuples(index=False, name='Row'))
+        with st.container(border=True):
+            st.markdown(f"**🔎 {row.ID} - {row.Type} | {row.Status}**")
+            detail_col1, detail_col2 = st.columns(2)
+            
+            with detail_col1:
+                st.markdown(f"**📍 Location:** {row.Location}")
+                st.markdown(f"**👮 Officer:** {row.Officer}")
+                st.markdown(f"**📊 Status:** {row.Status}")
+                st.markdown(f"**⚡ Priority:** {row.Priority}")
+            
+            with detail_col2:
+                st.markdown(f"**📅 Incident Date:** {row.Incident_Date:%Y-%m-%d}")
+                st.markdown(f"**📝 Registered:** {row.Date_Registered:%Y-%m-%d %H:%M:%S}")
+                st.markdown(f"**📎 Files:** {row.Files} attached")
+            
+            st.markdown(f"**📄 Description:**")
+            st.write(row.Description)
+            
+            if row.Notes:
+                st.markdown(f"**📋 Notes:**")
+                st.write(row.Notes)
+            
+            if row.Evidence is not None and len(row.Evidence):
+                st.markdown("**📎 Evidence Files:**")
+                for file_path in row.Evidence:
+                    file_name = os.path.basename(file_path)
+                    if os.path.exists(file_path):
+                        st.download_button(
+                            f"📄 {file_name}",
+                            load_file_bytes(file_path, os.path.getmtime(file_path)),
+                            file_name=file_name,
+                            key=f"download_{row.ID}_{file_name}"
+                        )
     else:
         st.info("🔍 No cases match your current filters. Try adjusting your search criteria.")
 
+@st.fragment
 def crime_statistics():
     st.subheader("📊 Crime Analytics Dashboard")
     
-    if not st.session_state.crimes:
+    if not st.session_state.agg['total']:
         st.warning("📭 No data available for analysis. Add some cases first.")
         return
     
-    df = pd.DataFrame(st.session_state.crimes)
+    agg = st.session_state.agg
+    officer_counts = counter_series(agg['officer'])
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Cases", len(df))
+        st.metric("Total Cases", agg['total'])
     with col2:
-        open_cases = len(df[df['Status'] == 'Open'])
-        st.metric("Open Cases", open_cases, delta=f"{open_cases/len(df)*100:.1f}%")
+        open_cases = agg['status']['Open']
+        st.metric("Open Cases", open_cases, delta=f"{open_cases/agg['total']*100:.1f}%")
     with col3:
-        high_priority = len(df[df['Priority'] == 'High'])
+        high_priority = agg['priority']['High']
         st.metric("High Priority", high_priority)
     with col4:
-        avg_cases_per_officer = len(df) / len(df['Officer'].unique()) if len(df['Officer'].unique()) > 0 else 0
+        avg_cases_per_officer = agg['total'] / len(officer_counts) if len(officer_counts) else 0
         st.metric("Avg Cases/Officer", f"{avg_cases_per_officer:.1f}")
     
     chart_col1, chart_col2 = st.columns(2)
     
     with chart_col1:
         st.markdown("### 📊 Case Status Distribution")
-        status_counts = df['Status'].value_counts()
+        status_counts = counter_series(agg['status'])
         fig_status = px.pie(values=status_counts.values, names=status_counts.index, title="Case Status Distribution", color_discrete_sequence=px.colors.qualitative.Set3)
         fig_status.update_traces(textposition='inside', textinfo='percent+label')
         st.plotly_chart(fig_status, use_container_width=True)
         
         st.markdown("### ⚡ Priority Level Analysis")
-        priority_counts = df['Priority'].value_counts()
+        priority_counts = counter_series(agg['priority'])
         fig_priority = px.bar(x=priority_counts.index, y=priority_counts.values, title="Cases by Priority Level", color=priority_counts.index, color_discrete_map={'Low': '#90EE90', 'Medium': '#FFD700', 'High': '#FF8C00', 'Critical': '#FF0000'})
         fig_priority.update_layout(showlegend=False)
         st.plotly_chart(fig_priority, use_container_width=True)
     
     with chart_col2:
         st.markdown("### 🔵 Crime Type Distribution")
-        type_counts = df['Type'].value_counts()
+        type_counts = counter_series(agg['type'])
         fig_type = px.bar(x=type_counts.values, y=type_counts.index, orientation='h', title="Crime Types Frequency", color=type_counts.values, color_continuous_scale='viridis')
         fig_type.update_layout(coloraxis_showscale=False)
         st.plotly_chart(fig_type, use_container_width=True)
         
         st.markdown("### 👮 Officer Workload")
-        officer_counts = df['Officer'].value_counts()
         fig_officer = px.bar(x=officer_counts.index, y=officer_counts.values, title="Cases per Officer", color=officer_counts.values, color_continuous_scale='blues')
         fig_officer.update_layout(coloraxis_showscale=False, xaxis_tickangle=-45)
         st.plotly_chart(fig_officer, use_container_width=True)
     
     st.markdown("### 📅 Timeline Analysis")
-    df['Incident_Date'] = pd.to_datetime(df['Incident_Date'])
-    df['Month_Year'] = df['Incident_Date'].dt.to_period('M').astype(str)
-    
-    timeline_data = df.groupby(['Month_Year', 'Type']).size().reset_index(name='Count')
+    timeline_data = timeline_frame(agg['timeline'])
     
     if not timeline_data.empty:
         fig_timeline = px.line(timeline_data, x='Month_Year', y='Count', color='Type', title='Crime Trends Over Time', markers=True)
@@ -326,16 +576,10 @@ def crime_statistics():
     with st.expander("📋 Detailed Statistics", expanded=False):
         st.markdown("### 📊 Summary Statistics")
         
-        summary_stats = {
-            'Crime Type': df['Type'].value_counts().to_dict(),
-            'Status': df['Status'].value_counts().to_dict(),
-            'Priority': df['Priority'].value_counts().to_dict(),
-            'Officer': df['Officer'].value_counts().to_dict()
-        }
+        summary_tables = build_summary_tables(st.session_state.agg_signature)
         
-        for category, stats in summary_stats.items():
+        for category, stats_df in summary_tables.items():
             st.markdown(f"**{category}:**")
-            stats_df = pd.DataFrame(list(stats.items()), columns=[category, 'Count'])
             st.dataframe(stats_df, hide_index=True)
 
 tab1, tab2, tab3, tab4 = st.tabs(["➕ Add Case", "📄 View Cases", "📈 Analytics", "⚙️ Settings"])
@@ -351,6 +595,7 @@ with tab3:
 
 with tab4:
     st.subheader("⚙️ System Settings")
+    now = datetime.now()
     
     st.markdown("### 💾 Data Management")
     col1, col2 = st.columns(2)
@@ -358,32 +603,31 @@ with tab4:
     with col1:
         if st.button("🗑️ Clear All Data", type="secondary"):
             if st.checkbox("I understand this will delete all cases"):
-                st.session_state.crimes = []
-                st.session_state.uploaded_files = {}
+                clear_crimes()
                 st.success("All data cleared successfully!")
                 st.rerun()
     
     with col2:
-        if st.session_state.crimes:
+        if st.session_state.agg['total']:
             backup_data = {
-                'crimes': st.session_state.crimes,
+                'crimes': backup_records(st.session_state.agg_signature),
                 'officers': st.session_state.officers,
-                'export_date': datetime.now().isoformat()
+                'export_date': now.isoformat()
             }
-            backup_json = json.dumps(backup_data, indent=2)
+            backup_json = orjson.dumps(backup_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC)
             st.download_button(
                 "💾 Backup Data (JSON)",
                 backup_json,
-                file_name=f"crime_system_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                file_name=f"crime_system_backup_{time.strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
     
     st.markdown("### ℹ️ System Information")
     st.info(f"""
     **System Status:** ✅ Active  
-    **Total Cases:** {len(st.session_state.crimes)}  
+    **Total Cases:** {st.session_state.agg['total']}  
     **Registered Officers:** {len(st.session_state.officers)}  
-    **Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    **Last Updated:** {now.isoformat(sep=' ', timespec='seconds')}
     """)
 
 st.markdown("---")